@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot tabanlı uyarı motoru.
+
+Kurallar alert_config.json içinde tanımlanır ve bir snapshot yayınlandıktan
+hemen sonra, yalnızca o snapshot'a bağlı kurallar için çalıştırılır
+(evaluate). Geçmiş taranmaz; kuralın ihtiyaç duyduğu önceki değer
+(ör. bir önceki "İşlem Bekliyor" toplamı) state dosyasında tutulur.
+
+Bir kural yeni tetiklendiğinde ve düzeldiğinde sink'lere birer kayıt gider:
+
+    {"type": "file"}                                  → output/alerts/alerts.jsonl
+    {"type": "banner"}                                → dashboard üst bandı
+    {"type": "webhook", "url": "http://127.0.0.1:9000/alert"}
+"""
+import os
+import json
+import time
+import logging
+import urllib.request
+from datetime import datetime
+
+import pandas as pd
+from filelock import FileLock
+
+import snapshot
+from throughput import drop_totals, hour_columns, load_targets
+
+# =====================================================
+# PATHS
+# =====================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(BASE_DIR, "alert_config.json")
+
+ALERT_DIR = os.path.join(BASE_DIR, "output", "alerts")
+os.makedirs(ALERT_DIR, exist_ok=True)
+
+STATE_PATH = os.path.join(ALERT_DIR, "state.json")
+STATE_LOCK = os.path.join(ALERT_DIR, "state.lock")
+BANNER_PATH = os.path.join(ALERT_DIR, "banner.json")
+FILE_SINK_PATH = os.path.join(ALERT_DIR, "alerts.jsonl")
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+STALE_CHECK_SECONDS = 30
+
+log = logging.getLogger("ALERT")
+
+# =====================================================
+# CONFIG
+# =====================================================
+def _read_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def load_config():
+    return _read_json(CONFIG_PATH, {"rules": [], "sinks": []})
+
+# =====================================================
+# KURALLAR
+# =====================================================
+# Her kural (rule, df, meta, prev) alır. prev, kurala ait ve bir sonraki
+# değerlendirmeye taşınan sözlüktür. Tetiklenmişse (mesaj, detay),
+# değilse None döner. Rapor tablolarının toplam satırı / saat kolonu
+# ayrıştırması throughput modülüyle ortaktır.
+def rule_backlog_growth(rule, df, meta, prev):
+    """İşlem Bekliyor toplamı saatte max_per_hour'dan hızlı artıyor mu?"""
+    value = meta.get("totals", {}).get(rule.get("total", "bekliyor"))
+    created = meta.get("created")
+    if value is None or created is None:
+        return None
+
+    last_value, last_time = prev.get("value"), prev.get("time")
+    prev.update(value=value, time=created)
+    if last_value is None or created <= last_time:
+        return None
+
+    rate = (value - last_value) / ((created - last_time) / 3600)
+    if rate < rule["max_per_hour"]:
+        return None
+    return (
+        f"İşlem Bekliyor saatte {int(rate)} adet artıyor ({last_value} → {value})",
+        {"rate_per_hour": int(rate), "previous": last_value, "current": value},
+    )
+
+
+def rule_kpi_below_target(rule, df, meta, prev):
+    """Son `hours` tamamlanmış saatin hepsinde hedefin altında kalan çalışanlar."""
+    if df.empty:
+        return None
+
+    target = rule.get("target")
+    if target is None:
+        target = load_targets().get(rule["snapshot"])
+    if not target:
+        return None
+    limit = target * rule.get("min_ratio", 1.0)
+
+    # Pencere, şu andan geriye doğru tamamlanmış saatlerdir (gece yarısını
+    # aşabilir); saatlerden biri tabloda yoksa (ör. vardiya değişti) kural
+    # değerlendirilmez.
+    now_hour = datetime.fromtimestamp(meta.get("created", time.time())).hour
+    saat_kolon = {h: c for c, h in hour_columns(df.columns[1:]).items()}
+    hours = [(now_hour - k) % 24 for k in range(rule.get("hours", 2), 0, -1)]
+    if not all(h in saat_kolon for h in hours):
+        return None
+    window = [saat_kolon[h] for h in hours]
+
+    name_col = df.columns[0]
+    people = drop_totals(df)
+    counts = people[window].apply(lambda s: pd.to_numeric(s, errors="coerce")).fillna(0)
+
+    below = (counts < limit).all(axis=1)
+    if rule.get("ignore_idle", True):
+        below &= counts.sum(axis=1) > 0
+
+    names = sorted(people.loc[below, name_col].astype(str))
+    if not names:
+        return None
+    return (
+        f"{len(names)} çalışan son {len(window)} saattir hedefin ({limit:g}/saat) altında",
+        {"employees": names, "hours": window, "limit": limit},
+    )
+
+
+def rule_empty_report(rule, df, meta, prev):
+    if not df.empty:
+        return None
+    return f"{rule['snapshot']} raporu boş geldi", {}
+
+
+def rule_stale_snapshot(rule, df, meta, prev):
+    """
+    Hiç üretilmemiş snapshot'ın yaşı rule["since"]'ten (zamanlayıcının
+    başlama anı) sayılır; sunucu ecomweb kapalıyken açılırsa da uyarı düşer.
+    """
+    created = meta.get("created")
+    if created is None and rule.get("since") is None:
+        return None
+    age = time.time() - (created if created is not None else rule["since"])
+    if age < rule.get("max_age_minutes", 10) * 60:
+        return None
+    if created is None:
+        return (
+            f"{rule['snapshot']} verisi {int(age // 60)} dakikadır hiç gelmedi",
+            {"age_seconds": int(age)},
+        )
+    return (
+        f"{rule['snapshot']} verisi {int(age // 60)} dakikadır güncellenmedi",
+        {"age_seconds": int(age)},
+    )
+
+
+RULES = {
+    "backlog_growth": rule_backlog_growth,
+    "kpi_below_target": rule_kpi_below_target,
+    "empty_report": rule_empty_report,
+    "stale_snapshot": rule_stale_snapshot,
+}
+
+# =====================================================
+# SINKS
+# =====================================================
+class FileSink:
+    def __init__(self, path=FILE_SINK_PATH, **_):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    def __init__(self, url, timeout=5, **_):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert):
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(alert, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        urllib.request.urlopen(req, timeout=self.timeout).close()
+
+
+class BannerSink:
+    """Aktif uyarıları dashboard'un okuduğu banner.json'da tutar."""
+
+    def __init__(self, path=BANNER_PATH, **_):
+        self.path = path
+
+    def send(self, alert):
+        with FileLock(self.path + ".lock"):
+            active = _read_json(self.path, {})
+            if alert["status"] == "firing":
+                active[alert["rule"]] = alert
+            else:
+                active.pop(alert["rule"], None)
+            _write_json(self.path, active)
+
+
+SINKS = {
+    "file": FileSink,
+    "webhook": WebhookSink,
+    "banner": BannerSink,
+}
+
+
+def _sinks(config):
+    out = []
+    for s in config.get("sinks", []):
+        cls = SINKS.get(s.get("type"))
+        if cls is None:
+            log.error(f"Bilinmeyen sink: {s.get('type')}")
+            continue
+        out.append(cls(**{k: v for k, v in s.items() if k != "type"}))
+    return out
+
+
+def _dispatch(alerts, config):
+    for sink in _sinks(config):
+        for alert in alerts:
+            try:
+                sink.send(alert)
+            except Exception as e:
+                log.error(f"{type(sink).__name__} gönderilemedi: {e}")
+
+# =====================================================
+# DEĞERLENDİRME
+# =====================================================
+def _run(rules, config):
+    """Kuralları çalıştırır; yalnızca durum değişimlerini sink'lere iletir."""
+    if not rules:
+        return []
+
+    changes = []
+    with FileLock(STATE_LOCK):
+        state = _read_json(STATE_PATH, {"previous": {}, "active": {}})
+
+        frames = {}
+        for rule in rules:
+            fn = RULES.get(rule["type"])
+            if fn is None:
+                log.error(f"Bilinmeyen kural tipi: {rule['type']}")
+                continue
+
+            name = rule["snapshot"]
+            if name not in frames:
+                frames[name] = snapshot.load(name)
+            df, meta = frames[name]
+
+            result = fn(rule, df, meta, state["previous"].setdefault(rule["id"], {}))
+            was_active = rule["id"] in state["active"]
+
+            alert = {
+                "rule": rule["id"],
+                "type": rule["type"],
+                "snapshot": name,
+                "time": datetime.now().strftime(TIME_FORMAT),
+            }
+            if result and not was_active:
+                message, details = result
+                alert.update(status="firing", message=message, details=details)
+                state["active"][rule["id"]] = alert
+                changes.append(alert)
+            elif result is None and was_active:
+                alert.update(status="resolved", message=state["active"].pop(rule["id"])["message"])
+                changes.append(alert)
+
+        _write_json(STATE_PATH, state)
+
+    _dispatch(changes, config)
+    return changes
+
+
+def evaluate(snapshot_name):
+    """Yeni yayınlanan snapshot'a bağlı tüm kuralları değerlendirir."""
+    config = load_config()
+    rules = [r for r in config.get("rules", []) if r.get("snapshot") == snapshot_name]
+    return _run(rules, config)
+
+
+def check_stale(since=None):
+    """
+    Veri hiç gelmediğinde snapshot yayını da olmaz; bayatlık kuralları bu
+    yüzden zamanlayıcı tarafından STALE_CHECK_SECONDS'te bir ayrıca
+    değerlendirilir. Snapshot'lar görüntülenmeden de tazelendiği için
+    bayatlık yalnızca başarısız ya da hiç yapılamayan çekimleri gösterir.
+    since: zamanlayıcının başlama anı, hiç üretilmemiş snapshot'lar için.
+    """
+    config = load_config()
+    rules = [
+        {**r, "since": since}
+        for r in config.get("rules", []) if r.get("type") == "stale_snapshot"
+    ]
+    return _run(rules, config)
+
+
+def banner():
+    """Dashboard'da gösterilecek aktif uyarılar."""
+    return list(_read_json(BANNER_PATH, {}).values())
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from throughput import drop_totals
+
+# =====================================================
+# KPI HESABI
+# =====================================================
+def compute_analytics(df, saat_cols, max_value_divisor=50):
+    """
+    Dashboard analiz panelinin hesap kısmı. Saat kolonlarını sayıya çevirir,
+    her saat için KPI kolonunu df'e ekler (yerinde) ve
+    (toplam adet, ortalama KPI, çalışan sayısı) döner.
+    """
+    for c in saat_cols:
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
+        df[f"{c} KPI"] = (df[c] / max_value_divisor * 100).clip(0, 100).astype(int)
+
+    toplam_adet = df[saat_cols].sum().sum()
+    kpi_mean = df[[f"{c} KPI" for c in saat_cols]].mean().mean()
+    calisan_sayisi = drop_totals(df)[df.columns[0]].nunique()
+
+    return toplam_adet, kpi_mean, calisan_sayisi
@@ -9,9 +9,14 @@ from dotenv import load_dotenv
 from filelock import FileLock
 from streamlit_autorefresh import st_autorefresh
 
-from toplama import run_report as run_toplama
-from yerlestirme import run_report as run_yerlestirme
-from backlog import run_report as run_backlog
+import auth
+from analytics import compute_analytics
+from throughput import drop_totals
+import snapshot
+import alerts
+import scheduler
+from fetch_guard import circuit_status
+from event_log import log_event, query as query_events
 
 # =====================================================
 # ENV
@@ -32,6 +37,60 @@ st_autorefresh(interval=60 * 1000, key="auto_refresh")
 st.set_page_config(page_title="Operasyon Dashboard", layout="wide")
 st.sidebar.title("📊 Operasyon Dashboard")
 
+# =====================================================
+# ZAMANLAYICI
+# =====================================================
+# Raporlar sayfa açılışından bağımsız olarak arka planda tazelenir ve
+# uyarılar yeni veri gelir gelmez değerlendirilir; sunucu süreci başına bir kez.
+@st.cache_resource
+def start_scheduler():
+    return scheduler.start()
+
+start_scheduler()
+
+# =====================================================
+# GİRİŞ
+# =====================================================
+# bcrypt yalnızca login anında çalışır; sonraki rerun'larda
+# imzalı token kontrolü yeterli.
+current_user = auth.verify_token(st.session_state.get("auth_token"))
+
+if current_user is None:
+    st.session_state.pop("auth_token", None)
+    st.header("🔐 Giriş")
+
+    with st.form("login_form"):
+        username = st.text_input("Kullanıcı Adı")
+        password = st.text_input("Şifre", type="password")
+        submitted = st.form_submit_button("Giriş Yap")
+
+    if submitted:
+        if auth.verify_password(username, password):
+            st.session_state["auth_token"] = auth.issue_token(username)
+            log_event("login", username)
+            st.rerun()
+        else:
+            log_event("login_failed", username)
+            st.error("Kullanıcı adı veya şifre hatalı")
+
+    st.stop()
+
+user_info = auth.get_user(current_user)
+user_reports = auth.allowed_reports(user_info)
+user_is_admin = auth.is_admin(user_info)
+
+st.sidebar.caption(f"👤 {user_info.get('name', current_user)}")
+if st.sidebar.button("Çıkış Yap"):
+    log_event("logout", current_user)
+    st.session_state.pop("auth_token", None)
+    st.rerun()
+
+# =====================================================
+# UYARILAR
+# =====================================================
+for alert in alerts.banner():
+    st.error(f"🚨 {alert['message']} ({alert['time']})")
+
 # =====================================================
 # AKTİF KULLANICI
 # =====================================================
@@ -45,8 +104,7 @@ with lock:
     else:
         active_users = {}
 
-    # Örnek kullanıcı: "Ziyaretçi"
-    active_users["Ziyaretçi"] = now.strftime("%Y-%m-%d %H:%M:%S")
+    active_users[current_user] = now.strftime("%Y-%m-%d %H:%M:%S")
 
     # eski kullanıcıları temizle
     cleaned = {}
@@ -64,52 +122,77 @@ with lock:
 active_users = cleaned
 
 # =====================================================
-# CACHE
+# SNAPSHOT
 # =====================================================
-@st.cache_data(ttl=120)
+# Raporlar Arrow snapshot olarak bir kez yazılır; tüm Streamlit süreçleri
+# aynı dosyayı memory-map ederek okur. Tazeleme zamanlayıcıdadır, sayfa
+# yalnızca yayındaki sürümü okur.
 def get_toplama():
-    return run_toplama()
+    return snapshot.load("toplama")
 
-@st.cache_data(ttl=120)
 def get_yerlestirme():
-    return run_yerlestirme()
-
-@st.cache_data(ttl=300)
-def get_backlog_safe():
-    try:
-        return run_backlog()
-    except Exception:
-        return pd.DataFrame(), {}, None
-
-last_update_time = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+    return snapshot.load("yerlestirme")
+
+def get_backlog():
+    return snapshot.load("backlog_pivot")
+
+def get_verim():
+    hourly, _ = snapshot.load("verim_saatlik")
+    leaderboard, meta = snapshot.load("verim_lider")
+    return hourly, leaderboard, meta
+
+def circuit_warning(report):
+    status = circuit_status(report)
+    if status["open"]:
+        st.warning(
+            f"⚠️ ecomweb'e ulaşılamıyor, son başarılı veri gösteriliyor. "
+            f"Yeniden deneme: {status['retry_in']} sn ({status['last_error']})"
+        )
+
+def update_time(meta):
+    created = meta.get("created")
+    if not created:
+        return "-"
+    return datetime.fromtimestamp(created).strftime("%d.%m.%Y %H:%M:%S")
 
 # =====================================================
 # MENU
 # =====================================================
-menu_items = ["👷 Toplama", "📦 Yerleştirme", "📈 Backlog", "🔑 Admin Paneli"]
+# Yetkisi olmayan sekme menüde hiç görünmez.
+MENU = [
+    ("👷 Toplama", "toplama"),
+    ("📦 Yerleştirme", "yerlestirme"),
+    ("📈 Backlog", "backlog"),
+]
+menu_items = [label for label, report in MENU if report in user_reports]
+if {"toplama", "yerlestirme"} <= user_reports:
+    menu_items.append("⚖️ Verimlilik")
+if user_is_admin:
+    menu_items.append("🔑 Admin Paneli")
+
+if not menu_items:
+    st.warning("Görüntüleme yetkiniz olan rapor yok")
+    st.stop()
+
 selected_tab = st.sidebar.radio("Menü Seç", menu_items)
 
+# Autorefresh rerun'ları değil, yalnızca sekme değişimleri kaydedilir
+if st.session_state.get("last_tab") != selected_tab:
+    st.session_state["last_tab"] = selected_tab
+    log_event("tab_view", current_user, tab=selected_tab)
+
 # =====================================================
 # ORTAK TOPLAM SATIRI SABİTLEYİCİ
 # =====================================================
 def move_total_bottom(df):
-    name_col = df.columns[0]
-    total_row = df[df[name_col].astype(str).str.upper() == "TOPLAM"]
-    df = df[df[name_col].astype(str).str.upper() != "TOPLAM"]
-    return pd.concat([df, total_row])
+    people = drop_totals(df)
+    return pd.concat([people, df.drop(people.index)])
 
 # =====================================================
 # ANALYTICS PANEL (detay ve KPI)
 # =====================================================
-def show_analytics(df, saat_cols, max_value_divisor=50):
-    # KPI hesapla
-    for c in saat_cols:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
-        df[f"{c} KPI"] = (df[c] / max_value_divisor * 100).clip(0, 100).astype(int)
-
-    toplam_adet = df[saat_cols].sum().sum()
-    kpi_mean = df[[f"{c} KPI" for c in saat_cols]].mean().mean()
-    calisan_sayisi = df[df[df.columns[0]].astype(str).str.upper() != "TOPLAM"][df.columns[0]].nunique()
+def show_analytics(df, saat_cols, max_value_divisor=50, report=None):
+    toplam_adet, kpi_mean, calisan_sayisi = compute_analytics(df, saat_cols, max_value_divisor)
 
     c1, c2, c3 = st.columns(3)
     c1.metric("Toplam Adet", int(toplam_adet))
@@ -128,20 +211,24 @@ def show_analytics(df, saat_cols, max_value_divisor=50):
     buffer = BytesIO()
     df.to_excel(buffer, index=False)
     buffer.seek(0)
-    st.download_button("⬇ Excel İndir", buffer, f"{df.columns[0]}_raporu.xlsx")
+    st.download_button(
+        "⬇ Excel İndir", buffer, f"{df.columns[0]}_raporu.xlsx",
+        on_click=log_event, args=("export", current_user), kwargs={"report": report}
+    )
 
 # =====================================================
 # TOPLAMA
 # =====================================================
 if selected_tab == "👷 Toplama":
     st.header("👷 Toplama KPI")
-    st.caption(f"🕒 Son Güncelleme: {last_update_time}")
 
-    df = get_toplama()
+    df, meta = get_toplama()
+    st.caption(f"🕒 Son Güncelleme: {update_time(meta)}")
+    circuit_warning("toplama")
     if not df.empty:
         df = move_total_bottom(df)
         saat_cols = [c for c in df.columns if ":" in c]
-        show_analytics(df, saat_cols, max_value_divisor=50)
+        show_analytics(df, saat_cols, max_value_divisor=50, report="toplama")
     else:
         st.warning("Veri yok")
 
@@ -150,13 +237,14 @@ if selected_tab == "👷 Toplama":
 # =====================================================
 elif selected_tab == "📦 Yerleştirme":
     st.header("📦 Yerleştirme KPI")
-    st.caption(f"🕒 Son Güncelleme: {last_update_time}")
 
-    df = get_yerlestirme()
+    df, meta = get_yerlestirme()
+    st.caption(f"🕒 Son Güncelleme: {update_time(meta)}")
+    circuit_warning("yerlestirme")
     if not df.empty:
         df = move_total_bottom(df)
         saat_cols = [c for c in df.columns if ":" in c]
-        show_analytics(df, saat_cols, max_value_divisor=100)
+        show_analytics(df, saat_cols, max_value_divisor=100, report="yerlestirme")
     else:
         st.warning("Veri yok")
 
@@ -165,14 +253,56 @@ elif selected_tab == "📦 Yerleştirme":
 # =====================================================
 elif selected_tab == "📈 Backlog":
     st.header("📈 Backlog Durumu")
-    st.caption(f"🕒 Son Güncelleme: {last_update_time}")
 
-    pivot, totals, _ = get_backlog_safe()
+    pivot, meta = get_backlog()
+    st.caption(f"🕒 Son Güncelleme: {update_time(meta)}")
+    circuit_warning("backlog")
     if not pivot.empty:
         st.dataframe(pivot)
     else:
         st.warning("Backlog verisi yok")
 
+# =====================================================
+# VERİMLİLİK (TOPLAMA + YERLEŞTİRME)
+# =====================================================
+elif selected_tab == "⚖️ Verimlilik":
+    st.header("⚖️ Toplama + Yerleştirme Verimlilik")
+
+    hourly, leaderboard, meta = get_verim()
+    st.caption(f"🕒 Son Güncelleme: {update_time(meta)}")
+    circuit_warning("toplama")
+    circuit_warning("yerlestirme")
+
+    if not leaderboard.empty:
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Çalışan Sayısı", len(leaderboard))
+        c2.metric("Toplama Adet", int(leaderboard["toplama"].sum()))
+        c3.metric("Yerleştirme Adet", int(leaderboard["yerlestirme"].sum()))
+
+        st.subheader("🏆 Liderlik Tablosu")
+        st.dataframe(
+            leaderboard.drop(columns="calisan_key").rename(columns={
+                "sira": "Sıra",
+                "calisan": "Çalışan",
+                "toplama": "Toplama",
+                "yerlestirme": "Yerleştirme",
+                "toplam": "Toplam",
+                "aktif_saat": "Aktif Saat",
+                "saatlik_ortalama": "Saatlik Ort.",
+                "kpi": "KPI",
+            }),
+            hide_index=True
+        )
+
+        st.subheader("⏱ Saatlik İş Gücü")
+        st.bar_chart(hourly.groupby("saat")[["toplama", "yerlestirme"]].sum())
+
+        secilen = st.selectbox("👤 Çalışan Detayı", leaderboard["calisan"])
+        key = leaderboard.loc[leaderboard["calisan"] == secilen, "calisan_key"].iloc[0]
+        st.bar_chart(hourly[hourly["calisan_key"] == key].set_index("saat")[["toplama", "yerlestirme"]])
+    else:
+        st.warning("Veri yok")
+
 # =====================================================
 # ADMIN PANEL
 # =====================================================
@@ -184,3 +314,33 @@ elif selected_tab == "🔑 Admin Paneli":
         {"Kullanıcı": u, "Son Görülme": t}
         for u, t in active_users.items()
     ]))
+
+    # =====================================================
+    # OLAY GEÇMİŞİ
+    # =====================================================
+    st.subheader("📜 Olay Geçmişi")
+
+    EVENT_ACTIONS = ["login", "login_failed", "logout", "tab_view", "export", "report_fetch"]
+
+    f1, f2, f3 = st.columns(3)
+    user_filter = f1.selectbox("Kullanıcı", ["(Tümü)"] + sorted(auth.load_users()))
+    action_filter = f2.multiselect("Olay", EVENT_ACTIONS)
+    date_range = f3.date_input("Tarih Aralığı", (now.date() - timedelta(days=7), now.date()))
+
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start_dt = datetime.combine(date_range[0], datetime.min.time())
+        end_dt = datetime.combine(date_range[1], datetime.max.time())
+    else:
+        start_dt, end_dt = None, None
+
+    events = query_events(
+        user=None if user_filter == "(Tümü)" else user_filter,
+        actions=action_filter,
+        start=start_dt,
+        end=end_dt,
+        limit=1000
+    )
+    if events:
+        st.dataframe(pd.DataFrame(events))
+    else:
+        st.info("Kayıt yok")
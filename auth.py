@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import secrets
+import threading
+
+import bcrypt
+from dotenv import load_dotenv
+
+# =====================================================
+# PATHS / ENV
+# =====================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+USERS_FILE = os.path.join(BASE_DIR, "users.json")
+
+# Token imza anahtarı. .env içinde AUTH_SECRET yoksa süreç başına rastgele
+# üretilir; bu durumda oturumlar yalnızca bu süreç yaşadığı sürece geçerlidir.
+AUTH_SECRET = (os.getenv("AUTH_SECRET") or secrets.token_hex(32)).encode()
+SESSION_TTL_SECONDS = 12 * 60 * 60  # 12 saat
+
+REPORTS = ("toplama", "yerlestirme", "backlog")
+
+# Bilinmeyen kullanıcılar da aynı bcrypt maliyetini ödesin diye karşılaştırılan
+# sabit cost-12 hash; login süresinden kullanıcı adının varlığı anlaşılmaz.
+DUMMY_HASH = b"$2b$12$UI3lVZE4.XhOZnywKfgV1.WWrP196siplpZE0PGu0Nym6CBtr93Sa"
+
+# =====================================================
+# KULLANICI DEPOSU (mtime cache)
+# =====================================================
+_store_lock = threading.Lock()
+_store = {"mtime": None, "users": {}}
+
+
+def load_users():
+    """
+    users.json içeriğini döner. Dosya yalnızca mtime değiştiğinde
+    yeniden okunur; diğer tüm çağrılar bellekteki kopyayı kullanır.
+    """
+    try:
+        mtime = os.stat(USERS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    if _store["mtime"] == mtime:
+        return _store["users"]
+
+    with _store_lock:
+        if _store["mtime"] != mtime:
+            with open(USERS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _store["users"] = data.get("usernames", {})
+            _store["mtime"] = mtime
+
+    return _store["users"]
+
+
+def get_user(username):
+    return load_users().get(username)
+
+# =====================================================
+# YETKİLER
+# =====================================================
+def is_admin(user):
+    if "role" in user:
+        return user["role"] == "admin"
+    return "admin" in user.get("roles", [])
+
+
+def allowed_reports(user):
+    """
+    Kullanıcının görebildiği raporlar. `permissions` tanımlıysa o esas
+    alınır, yoksa `roles` listesine bakılır.
+    """
+    perms = user.get("permissions")
+    if perms is not None:
+        return {r for r in REPORTS if perms.get(r)}
+    return {r for r in REPORTS if r in user.get("roles", [])}
+
+# =====================================================
+# LOGIN
+# =====================================================
+def verify_password(username, password):
+    """
+    bcrypt doğrulaması. Yalnızca login anında çağrılmalı (cost 12 ≈ 250 ms).
+    Kullanıcı yoksa ya da hash'i yoksa DUMMY_HASH ile aynı süre harcanır.
+
+    Deneme sınırlaması yapılmaz; users.json'daki failed_login_attempts
+    burada okunmaz ve güncellenmez.
+    """
+    if not password:
+        return False
+
+    stored = (get_user(username) or {}).get("password")
+    try:
+        ok = bcrypt.checkpw(password.encode(), stored.encode() if stored else DUMMY_HASH)
+    except ValueError:
+        bcrypt.checkpw(password.encode(), DUMMY_HASH)
+        return False
+    return ok and bool(stored)
+
+# =====================================================
+# SESSION TOKEN
+# =====================================================
+def _hash_fingerprint(user):
+    # Şifre değişirse eski tokenlar geçersiz olsun
+    return hashlib.sha256(user.get("password", "").encode()).hexdigest()[:16]
+
+
+def _sign(payload):
+    return hmac.new(AUTH_SECRET, payload, hashlib.sha256).hexdigest()
+
+
+def issue_token(username):
+    user = get_user(username)
+    expires = int(time.time()) + SESSION_TTL_SECONDS
+    payload = f"{username}|{expires}|{_hash_fingerprint(user)}".encode()
+    return base64.urlsafe_b64encode(payload).decode() + "." + _sign(payload)
+
+
+def verify_token(token):
+    """
+    Token geçerliyse kullanıcı adını, değilse None döner.
+    Her rerun'da çağrılır; yalnızca HMAC ve sözlük erişimi yapar.
+    """
+    if not token or "." not in token:
+        return None
+    try:
+        b64, sig = token.rsplit(".", 1)
+        payload = base64.urlsafe_b64decode(b64.encode())
+        username, expires, fingerprint = payload.decode().split("|")
+        expires = int(expires)
+    except ValueError:
+        return None
+
+    if not hmac.compare_digest(_sign(payload), sig):
+        return None
+    if expires < time.time():
+        return None
+
+    user = get_user(username)
+    if not user or not hmac.compare_digest(_hash_fingerprint(user), fingerprint):
+        return None
+    return username
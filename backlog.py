@@ -14,6 +14,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from fetch_guard import guarded
+
 # =====================================================
 # PATHS
 # =====================================================
@@ -148,6 +150,7 @@ def build_report(df: pd.DataFrame):
 
     detail_csv = os.path.join(REPORT_DIR, f"Backlog_Detail_{datetime.now().strftime('%Y%m%d_%H%M')}.csv")
     df.to_csv(detail_csv, index=False, encoding="utf-8-sig")
+    log.info(f"Detay CSV yazıldı: {detail_csv}")
 
     pivot = (
         df.groupby([df["SiparisTarihi"].dt.date, "Statu"])["Miktar"]
@@ -177,20 +180,21 @@ def build_report(df: pd.DataFrame):
     pivot.reset_index(inplace=True)
     pivot.rename(columns={"SiparisTarihi": "Sipariş Tarihi"}, inplace=True)
 
-    return pivot, totals, detail_csv
+    return pivot, totals, df
 
 # =====================================================
 # MAIN ENTRY FOR DASHBOARD
 # =====================================================
 def run_report():
     """
-    Backlog raporunu çalıştırır, pivot tablo ve totals döner.
+    Backlog raporunu çalıştırır, pivot tablo, totals ve detay DataFrame döner.
     Streamlit dashboard içinde kullanılacak.
     """
     end = datetime.now()
     start = end - timedelta(days=DAYS)
 
-    login_and_export(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
-    df = pd.read_excel(latest_xlsx(), engine="openpyxl")
-    pivot, totals, csv_path = build_report(df)
-    return pivot, totals, csv_path
\ No newline at end of file
+    with guarded("backlog"):
+        login_and_export(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+        df = pd.read_excel(latest_xlsx(), engine="openpyxl")
+    pivot, totals, detail = build_report(df)
+    return pivot, totals, detail
\ No newline at end of file
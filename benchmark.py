@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Ayrıştırma ve hesap aşamaları için mikro benchmark.
+
+    python benchmark.py                 # 1x ve 10x
+    python benchmark.py --scales 1 10 100 --repeat 5 --json sonuc.json
+
+Her aşama için en iyi / medyan süre ve tracemalloc ile ölçülen tepe bellek
+raporlanır. Veriler synthetic_data.py ile üretilir; ağ ve tarayıcı kullanılmaz.
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from unittest import mock
+
+import pandas as pd
+
+import toplama
+import yerlestirme
+import backlog
+import throughput
+from analytics import compute_analytics
+import synthetic_data as sd
+
+# =====================================================
+# ÖLÇÜM
+# =====================================================
+def measure(fn, repeat):
+    """fn'i repeat kez çalıştırır; süreler ve ayrı bir koşuda tepe bellek."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "best_ms": min(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+# =====================================================
+# AŞAMALAR
+# =====================================================
+def stages(scale, workdir):
+    """(aşama adı, satır sayısı, fonksiyon) listesi; veri burada bir kez üretilir."""
+    out = []
+
+    # --- Toplama: grid → DataFrame, ardından dashboard KPI hesabı
+    headers, rows = sd.make_grid(scale)
+    driver = sd.FakeDriver(headers, rows)
+
+    def read_grid():
+        with mock.patch.object(toplama.time, "sleep"):
+            return toplama.read_grid(driver)
+
+    out.append(("toplama.read_grid", len(rows), read_grid))
+
+    grid_df = read_grid()
+    saat_cols = [c for c in grid_df.columns if ":" in c]
+    out.append((
+        "analytics.compute_analytics",
+        len(grid_df),
+        lambda: compute_analytics(grid_df.copy(), saat_cols, max_value_divisor=50),
+    ))
+
+    # --- Yerleştirme: saat kolonu eşleme + xlsx düzenleme
+    inbound = sd.make_inbound_frame(scale)
+    values = list(inbound.columns[1:]) * max(1, len(inbound) // 10)
+
+    def saat_eslestir():
+        return [yerlestirme.vardiya_araliginda_mi(yerlestirme.saat_al(v), "Sabah") for v in values]
+
+    out.append(("yerlestirme.saat_al+vardiya", len(values), saat_eslestir))
+
+    inbound_xlsx = sd.write_xlsx(inbound, os.path.join(workdir, f"yerlestirme_x{scale:g}.xlsx"))
+    if inbound_xlsx:
+        out.append((
+            "yerlestirme.excel_duzenle",
+            len(inbound),
+            lambda: yerlestirme.excel_duzenle(inbound_xlsx, "Sabah"),
+        ))
+
+    # --- Verimlilik: iki raporun çalışan × saat birleşimi
+    out.append((
+        "throughput.build",
+        len(grid_df) + len(inbound),
+        lambda: throughput.build(grid_df, inbound),
+    ))
+
+    # --- Backlog: xlsx okuma ve pivot
+    outbound = sd.make_outbound_frame(scale)
+    outbound_xlsx = sd.write_xlsx(outbound, os.path.join(workdir, f"backlog_x{scale:g}.xlsx"))
+    if outbound_xlsx:
+        out.append((
+            "backlog.read_excel",
+            len(outbound),
+            lambda: pd.read_excel(outbound_xlsx, engine="openpyxl"),
+        ))
+
+    def build_report():
+        with mock.patch.object(backlog, "REPORT_DIR", workdir):
+            return backlog.build_report(outbound.copy())
+
+    out.append(("backlog.build_report", len(outbound), build_report))
+
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ayrıştırma mikro benchmark")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'aşama':<32}{'ölçek':>7}{'satır':>10}{'en iyi ms':>12}{'medyan ms':>12}{'tepe MB':>10}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            for name, n, fn in stages(scale, workdir):
+                r = measure(fn, args.repeat)
+                r.update({"stage": name, "scale": scale, "rows": n})
+                results.append(r)
+                print(
+                    f"{name:<32}{scale:>6g}x{n:>10}"
+                    f"{r['best_ms']:>12.1f}{r['median_ms']:>12.1f}{r['peak_mb']:>10.1f}"
+                )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import json
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from filelock import FileLock
+
+# =====================================================
+# PATHS
+# =====================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENT_DIR = os.path.join(BASE_DIR, "logs", "events")
+os.makedirs(EVENT_DIR, exist_ok=True)
+
+LOCK_PATH = os.path.join(EVENT_DIR, "events.lock")
+
+# =====================================================
+# AYARLAR
+# =====================================================
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+MAX_SEGMENT_BYTES = 20 * 1024 * 1024  # 20 MB'ı geçen gün dosyası bölünür
+FLUSH_EVENTS = 50                      # bu kadar olay birikince yaz
+FLUSH_SECONDS = 5                      # ya da en geç bu kadar saniyede bir
+CHUNK_BYTES = 256 * 1024               # index çözünürlüğü: segment bu boyda bloklara bölünür
+
+SEGMENT_RE = re.compile(r"^events_(\d{8})_(\d{3})\.jsonl$")
+
+log = logging.getLogger("EVENTS")
+
+# =====================================================
+# BUFFER
+# =====================================================
+_buffer = []
+_buffer_lock = threading.Lock()
+_flusher = None
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_SECONDS)
+        flush()
+
+
+def _start_flusher():
+    """Sessiz süreçlerde de tampon en geç FLUSH_SECONDS içinde diske iner."""
+    global _flusher
+    if _flusher is None:
+        with _buffer_lock:
+            if _flusher is None:
+                _flusher = threading.Thread(target=_flush_loop, name="event-log-flush", daemon=True)
+                _flusher.start()
+
+
+def log_event(action, user=None, **details):
+    """
+    Olayı belleğe ekler. Diske toplu halde, append-only olarak yazılır.
+    Örn: log_event("login", "admin"), log_event("export", "op", report="toplama")
+    """
+    event = {"time": datetime.now().strftime(TIME_FORMAT), "user": user, "action": action}
+    event.update(details)
+
+    _start_flusher()
+
+    with _buffer_lock:
+        _buffer.append(event)
+        due = len(_buffer) >= FLUSH_EVENTS
+
+    if due:
+        flush()
+
+
+def flush():
+    """
+    Tamponu diske yazar. Yazma hata verirse (disk dolu, izin, kilit) henüz
+    yazılmamış günlerin olayları tamponun başına geri konur ve bir sonraki
+    flush'ta tekrar denenir; hata çağırana (sayfaya) iletilmez.
+    """
+    with _buffer_lock:
+        events = _buffer[:]
+        _buffer.clear()
+
+    if not events:
+        return
+
+    by_day = {}
+    for e in events:
+        by_day.setdefault(e["time"][:10].replace("-", ""), []).append(e)
+
+    written = set()
+    try:
+        with FileLock(LOCK_PATH):
+            for day, day_events in by_day.items():
+                _append(day, day_events)
+                written.add(day)
+    except Exception as e:
+        pending = [ev for day, day_events in by_day.items() if day not in written for ev in day_events]
+        with _buffer_lock:
+            _buffer[:0] = pending
+        log.error(f"Olay kaydı yazılamadı, {len(pending)} olay tamponda bekliyor: {e}")
+
+
+atexit.register(flush)
+
+# =====================================================
+# SEGMENT / INDEX
+# =====================================================
+def _segment_path(day, part):
+    return os.path.join(EVENT_DIR, f"events_{day}_{part:03d}.jsonl")
+
+
+def _index_path(segment_path):
+    return segment_path[:-len(".jsonl")] + ".idx.json"
+
+
+def _segments():
+    """(gün, parça, yol) listesi, eskiden yeniye sıralı."""
+    out = []
+    for name in os.listdir(EVENT_DIR):
+        m = SEGMENT_RE.match(name)
+        if m:
+            out.append((m.group(1), int(m.group(2)), os.path.join(EVENT_DIR, name)))
+    return sorted(out)
+
+
+def _read_index(segment_path):
+    """
+    Segment index'i (küçük ve seyrek):
+        first / last : segmentteki en eski / en yeni olay zamanı
+        chunks       : CHUNK_BYTES'lık her blok için [en eski, en yeni] zaman
+        users        : kullanıcı → olayının geçtiği blok numaraları
+    """
+    try:
+        with open(_index_path(segment_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"first": None, "last": None, "count": 0, "chunks": [], "users": {}}
+
+
+def _write_index(segment_path, index):
+    path = _index_path(segment_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _widen(bounds, t):
+    if bounds is None:
+        return [t, t]
+    return [min(bounds[0], t), max(bounds[1], t)]
+
+
+def _append(day, events):
+    parts = [p for d, p, _ in _segments() if d == day]
+    part = parts[-1] if parts else 0
+    path = _segment_path(day, part)
+    if os.path.exists(path) and os.path.getsize(path) >= MAX_SEGMENT_BYTES:
+        part += 1
+        path = _segment_path(day, part)
+
+    index = _read_index(path)
+    chunks = index["chunks"]
+
+    with open(path, "ab") as f:
+        for e in events:
+            chunk = f.tell() // CHUNK_BYTES
+            f.write(json.dumps(e, ensure_ascii=False).encode("utf-8") + b"\n")
+
+            chunks.extend([None] * (chunk + 1 - len(chunks)))
+            chunks[chunk] = _widen(chunks[chunk], e["time"])
+            user_chunks = index["users"].setdefault(str(e["user"]), [])
+            if not user_chunks or user_chunks[-1] != chunk:
+                user_chunks.append(chunk)
+
+    # Süreçler kendi tamponlarını farklı anlarda boşalttığı için olaylar
+    # dosyaya zaman sırasıyla düşmeyebilir; sınırlar min/max ile tutulur.
+    times = [e["time"] for e in events]
+    index["count"] += len(events)
+    index["first"] = min([index["first"], *times] if index["first"] else times)
+    index["last"] = max([index["last"], *times] if index["last"] else times)
+    _write_index(path, index)
+
+# =====================================================
+# SORGU
+# =====================================================
+def query(user=None, actions=None, start=None, end=None, limit=1000):
+    """
+    Olayları yeniden eskiye döner.
+    start / end: datetime. Gün dosyası adı ve index'teki zaman sınırları ile
+    kapsam dışı segmentler ve bloklar açılmadan atlanır; user verilirse
+    yalnızca kullanıcının geçtiği bloklar okunur. Bellekte en fazla bir
+    segmentin eşleşmeleri tutulur.
+    """
+    flush()
+
+    start_s = start.strftime(TIME_FORMAT) if start else None
+    end_s = end.strftime(TIME_FORMAT) if end else None
+    actions = set(actions) if actions else None
+
+    results = []
+    for day, _, path in reversed(_segments()):
+        if start_s and day < start_s[:10].replace("-", ""):
+            break
+        if end_s and day > end_s[:10].replace("-", ""):
+            continue
+
+        index = _read_index(path)
+        if start_s and index["last"] and index["last"] < start_s:
+            continue
+        if end_s and index["first"] and index["first"] > end_s:
+            continue
+
+        chunks = index["chunks"]
+        candidates = index["users"].get(str(user), []) if user is not None else range(len(chunks))
+        candidates = [
+            c for c in candidates
+            if chunks[c]
+            and not (start_s and chunks[c][1] < start_s)
+            and not (end_s and chunks[c][0] > end_s)
+        ]
+        if not candidates:
+            continue
+
+        matches = [
+            e for e in _read_chunks(path, candidates)
+            if (user is None or str(e.get("user")) == str(user))
+            and (not actions or e.get("action") in actions)
+            and (not start_s or e["time"] >= start_s)
+            and (not end_s or e["time"] <= end_s)
+        ]
+        matches.sort(key=lambda e: e["time"], reverse=True)
+        for e in matches:
+            results.append(e)
+            if limit and len(results) >= limit:
+                return results
+
+    return results
+
+
+def _read_chunks(path, chunks):
+    """Başlangıç ofseti verilen bloklara düşen satırları okur."""
+    with open(path, "rb") as f:
+        for chunk in chunks:
+            start = chunk * CHUNK_BYTES
+            end = start + CHUNK_BYTES
+            if start:
+                # Önceki bloktan taşan satırı atla
+                f.seek(start - 1)
+                f.readline()
+            else:
+                f.seek(0)
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    yield json.loads(line)
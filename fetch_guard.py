@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+ecomweb çağrıları için süreçler arası koruma.
+
+- Tarayıcı limiti: aynı anda en fazla MAX_BROWSERS headless Chrome açılır.
+  Slotlar dosya kilididir, bu yüzden tüm Streamlit süreçleri için geçerlidir.
+- Circuit breaker: bir rapor FAILURE_THRESHOLD kez üst üste hata verirse
+  devre açılır ve çağıranlar tarayıcı açmadan CircuitOpenError alır. Açık
+  kalma süresi her yeni hatada ikiye katlanır (BREAKER_MAX_SECONDS'e kadar).
+  Süre dolunca tek bir süreç deneme çağrısı yapar; başarılıysa devre kapanır.
+
+    with guarded("toplama"):
+        df = fetch_report()
+"""
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+from filelock import FileLock, Timeout
+
+# =====================================================
+# AYARLAR
+# =====================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GUARD_DIR = os.path.join(BASE_DIR, "output", "guard")
+os.makedirs(GUARD_DIR, exist_ok=True)
+
+MAX_BROWSERS = int(os.getenv("MAX_BROWSERS", "2"))
+SLOT_WAIT_SECONDS = 20
+
+FAILURE_THRESHOLD = 2
+BREAKER_BASE_SECONDS = 60
+BREAKER_MAX_SECONDS = 30 * 60
+PROBE_SECONDS = 180  # deneme çağrısı sürerken diğerleri beklemeden düşer
+
+log = logging.getLogger("GUARD")
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class BrowserBusyError(Exception):
+    pass
+
+# =====================================================
+# TARAYICI LİMİTİ
+# =====================================================
+@contextmanager
+def browser_slot(timeout=SLOT_WAIT_SECONDS):
+    """Boş bir Chrome slotu bulana kadar (en fazla timeout sn) bekler."""
+    deadline = time.time() + timeout
+    while True:
+        for i in range(MAX_BROWSERS):
+            lock = FileLock(os.path.join(GUARD_DIR, f"browser_{i}.lock"))
+            try:
+                lock.acquire(timeout=0)
+            except Timeout:
+                continue
+            try:
+                yield
+            finally:
+                lock.release()
+            return
+
+        if time.time() >= deadline:
+            raise BrowserBusyError(f"{MAX_BROWSERS} tarayıcı slotu da dolu")
+        time.sleep(0.5)
+
+# =====================================================
+# CIRCUIT BREAKER
+# =====================================================
+def _state_path(endpoint):
+    return os.path.join(GUARD_DIR, f"{endpoint}.circuit.json")
+
+
+def _read_state(endpoint):
+    try:
+        with open(_state_path(endpoint), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"failures": 0, "open_until": 0, "last_error": None}
+
+
+def _write_state(endpoint, state):
+    path = _state_path(endpoint)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _update(endpoint, fn):
+    with FileLock(_state_path(endpoint) + ".lock"):
+        state = _read_state(endpoint)
+        result = fn(state)
+        _write_state(endpoint, state)
+    return result
+
+
+def circuit_status(endpoint):
+    """Dashboard için: {"open": bool, "retry_in": sn, "failures": n, "last_error": str}"""
+    state = _read_state(endpoint)
+    retry_in = max(0, state["open_until"] - time.time())
+    return {
+        "open": state["failures"] >= FAILURE_THRESHOLD and retry_in > 0,
+        "retry_in": int(retry_in),
+        "failures": state["failures"],
+        "last_error": state["last_error"],
+    }
+
+
+def _raise_if_open(state, endpoint):
+    now = time.time()
+    if state["failures"] >= FAILURE_THRESHOLD and now < state["open_until"]:
+        raise CircuitOpenError(
+            f"{endpoint}: devre açık, {int(state['open_until'] - now)} sn sonra tekrar denenecek"
+        )
+
+
+def _claim_call(endpoint):
+    """
+    Tarayıcı slotu alındıktan sonra çağrılır. Devre hâlâ açıksa düşer;
+    yarı açıksa deneme çağrısını bu süreç üstlenir. Slot beklerken yarı
+    açık duruma geçilmez, böylece yerel slot darlığı devreyi açık tutmaz.
+    """
+    def claim(state):
+        _raise_if_open(state, endpoint)
+        if state["failures"] >= FAILURE_THRESHOLD:
+            state["open_until"] = time.time() + PROBE_SECONDS
+
+    _update(endpoint, claim)
+
+
+def _after_failure(endpoint, error):
+    def fail(state):
+        state["failures"] += 1
+        state["last_error"] = str(error)[:500]
+        if state["failures"] >= FAILURE_THRESHOLD:
+            backoff = BREAKER_BASE_SECONDS * 2 ** (state["failures"] - FAILURE_THRESHOLD)
+            state["open_until"] = time.time() + min(backoff, BREAKER_MAX_SECONDS)
+            log.warning(f"{endpoint}: devre açıldı ({state['failures']} hata), {min(backoff, BREAKER_MAX_SECONDS)} sn")
+
+    _update(endpoint, fail)
+
+
+def _after_success(endpoint):
+    def ok(state):
+        if state["failures"]:
+            log.info(f"{endpoint}: devre kapandı")
+        state.update(failures=0, open_until=0, last_error=None)
+
+    _update(endpoint, ok)
+
+
+@contextmanager
+def guarded(endpoint):
+    """
+    Devre açıksa hemen CircuitOpenError, slot bulunamazsa BrowserBusyError
+    fırlatır. Gövdedeki hatalar devreye hata olarak yazılıp aynen iletilir.
+    """
+    # Devre açıkken slot beklemeden hemen düş
+    _raise_if_open(_read_state(endpoint), endpoint)
+    with browser_slot():
+        _claim_call(endpoint)
+        try:
+            yield
+        except Exception as e:
+            _after_failure(endpoint, e)
+            raise
+    _after_success(endpoint)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Rapor tazeleme zamanlayıcısı.
+
+Snapshot'lar sayfa render'ından bağımsız olarak, her rapor için ayrı bir
+daemon thread'de TTL'e göre tazelenir; yeni snapshot yayınlanır yayınlanmaz
+uyarı kuralları değerlendirilir. Böylece uyarılar kimse ilgili sekmeye
+bakmasa da veri geldikten saniyeler sonra düşer.
+
+Birden fazla Streamlit süreci kendi zamanlayıcısını başlatabilir; aynı anda
+yalnızca bir süreç tazeleme yapar (snapshot.ensure_fresh kilidi).
+"""
+import time
+import logging
+import threading
+
+import snapshot
+import alerts
+import throughput
+from toplama import run_report as run_toplama
+from yerlestirme import run_report as run_yerlestirme
+from backlog import run_report as run_backlog
+from fetch_guard import CircuitOpenError, BrowserBusyError
+from event_log import log_event
+
+POLL_SECONDS = 5
+STARTED_AT = None  # start() çağrıldığı an; hiç gelmeyen snapshot'ların yaşı buradan sayılır
+VERIM_SOURCES = ["toplama", "yerlestirme"]
+
+log = logging.getLogger("SCHEDULER")
+
+# =====================================================
+# ÇEKİM
+# =====================================================
+# Çekim hata verirse hiçbir şey yayınlanmaz, son başarılı snapshot kullanımda
+# kalır. Devre açıkken ya da tarayıcı slotu yokken çağrı anında düşer ve
+# olay olarak da kaydedilmez.
+def timed_fetch(report, fn):
+    t0 = time.time()
+    try:
+        result = fn()
+    except (CircuitOpenError, BrowserBusyError):
+        return None
+    except Exception as e:
+        log_event("report_fetch", report=report, error=str(e), seconds=round(time.time() - t0, 1))
+        return None
+
+    rows = len(result[0]) if isinstance(result, tuple) else len(result)
+    log_event("report_fetch", report=report, rows=rows, seconds=round(time.time() - t0, 1))
+    return result
+
+
+def fetch_toplama():
+    df = timed_fetch("toplama", lambda: run_toplama(raise_errors=True))
+    return {} if df is None else {"toplama": (df, None)}
+
+
+def fetch_yerlestirme():
+    df = timed_fetch("yerlestirme", lambda: run_yerlestirme(raise_errors=True))
+    return {} if df is None else {"yerlestirme": (df, None)}
+
+
+def fetch_backlog():
+    result = timed_fetch("backlog", run_backlog)
+    if result is None:
+        return {}
+    pivot, totals, detail = result
+    return {
+        "backlog_detail": (detail, None),
+        "backlog_pivot": (pivot, {"totals": totals}),
+    }
+
+
+# Birleşik verimlilik tabloları toplama + yerleştirme snapshot çiftinden bir
+# kez türetilir; kaynaklardan biri yenilenmedikçe tekrar hesaplanmaz.
+def build_verim():
+    toplama_df, _ = snapshot.load("toplama")
+    yerlestirme_df, _ = snapshot.load("yerlestirme")
+    _, hourly, leaderboard = throughput.build(toplama_df, yerlestirme_df)
+    return {
+        "verim_saatlik": (hourly, None),
+        "verim_lider": (leaderboard, None),
+    }
+
+
+JOBS = [
+    ("toplama", 120, fetch_toplama),
+    ("yerlestirme", 120, fetch_yerlestirme),
+    ("backlog_pivot", 300, fetch_backlog),
+]
+
+# =====================================================
+# DÖNGÜLER
+# =====================================================
+def _refresh_loop(name, ttl, producer):
+    while True:
+        try:
+            if snapshot.ensure_fresh(name, ttl, producer):
+                alerts.evaluate(name)
+                if name in VERIM_SOURCES:
+                    snapshot.ensure_derived("verim_lider", VERIM_SOURCES, build_verim)
+        except Exception as e:
+            log.error(f"{name} tazelenemedi: {e}")
+        time.sleep(POLL_SECONDS)
+
+
+def _stale_loop():
+    while True:
+        try:
+            alerts.check_stale(since=STARTED_AT)
+        except Exception as e:
+            log.error(f"Bayatlık kontrolü başarısız: {e}")
+        time.sleep(alerts.STALE_CHECK_SECONDS)
+
+
+def start():
+    """Her rapor için bir tazeleme thread'i ve bir bayatlık thread'i başlatır."""
+    global STARTED_AT
+    STARTED_AT = time.time()
+    threads = [
+        threading.Thread(target=_refresh_loop, args=job, name=f"refresh-{job[0]}", daemon=True)
+        for job in JOBS
+    ]
+    threads.append(threading.Thread(target=_stale_loop, name="stale-check", daemon=True))
+    for t in threads:
+        t.start()
+    return threads
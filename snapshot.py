@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import threading
+
+import pandas as pd
+import pyarrow as pa
+from filelock import FileLock, Timeout
+
+# =====================================================
+# PATHS
+# =====================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "output", "snapshots")
+os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+
+META_KEY = b"snapshot_meta"
+KEEP_VERSIONS = 2  # yayındaki + bir önceki sürüm diskte tutulur
+
+# =====================================================
+# YOLLAR
+# =====================================================
+# Her yayın yeni bir sürüm dosyası yazar (toplama__<ns>.arrow); hangi
+# sürümün geçerli olduğunu küçük bir işaretçi dosyası (toplama.current)
+# söyler ve bu dosya os.replace ile atomik olarak değiştirilir. Böylece
+# okuyucuların memory-map ettiği dosyanın üzerine hiç yazılmaz.
+def _pointer_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.current")
+
+
+def _lock_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.lock")
+
+
+def _version_files(name):
+    out = []
+    for f in os.listdir(SNAPSHOT_DIR):
+        if f.endswith(".arrow") and f[:-len(".arrow")].rsplit("__", 1)[0] == name:
+            out.append(f)
+    return sorted(out)
+
+
+def current_version(name):
+    """Yayındaki sürüm dosyasının adı, snapshot yoksa None."""
+    try:
+        with open(_pointer_path(name), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+# =====================================================
+# YAZMA
+# =====================================================
+def _arrow_uyumlu(df):
+    """
+    Rapor tablolarındaki karışık tipli kolonları (ör. toplam satırındaki ""
+    değerleri) Arrow'un kabul edeceği hale getirir.
+    """
+    df = df.reset_index(drop=True)
+    for c in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[c], from_pandas=True)
+            continue
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+
+        dolu = df[c].notna() & (df[c].astype(str).str.strip() != "")
+        sayi = pd.to_numeric(df[c].where(dolu), errors="coerce")
+        if sayi.notna().sum() == dolu.sum():
+            df[c] = sayi
+        else:
+            df[c] = df[c].astype(str).where(df[c].notna(), None)
+    return df
+
+
+def publish(name, df, meta=None):
+    """
+    DataFrame'i Arrow IPC dosyası olarak yazar ve atomik olarak yayınlar.
+    meta: JSON'a çevrilebilir sözlük (ör. backlog totals).
+    """
+    meta = dict(meta or {})
+    meta.setdefault("created", time.time())
+
+    table = pa.Table.from_pandas(_arrow_uyumlu(df), preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        META_KEY: json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+    })
+
+    version = f"{name}__{time.time_ns()}.arrow"
+    path = os.path.join(SNAPSHOT_DIR, version)
+    tmp = path + ".tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+    pointer_tmp = _pointer_path(name) + ".tmp"
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer_tmp, _pointer_path(name))
+
+    for old in _version_files(name)[:-KEEP_VERSIONS]:
+        try:
+            os.remove(os.path.join(SNAPSHOT_DIR, old))
+        except OSError:
+            # Windows'ta hâlâ map edilmiş dosya silinemez; sonraki yayında denenir
+            pass
+
+    return version
+
+# =====================================================
+# OKUMA
+# =====================================================
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def _open(name):
+    """
+    Yayındaki sürümü memory-map ederek açar. Tablo süreç içinde sürüm
+    değişene kadar saklanır; sayfalar OS cache üzerinden süreçler arasında
+    paylaşılır, kopya ya da unpickle yapılmaz.
+    """
+    version = current_version(name)
+    if version is None:
+        return None, None, None
+
+    cached = _tables.get(name)
+    if cached and cached[0] == version:
+        return cached
+
+    with _tables_lock:
+        source = pa.memory_map(os.path.join(SNAPSHOT_DIR, version), "r")
+        table = pa.ipc.open_file(source).read_all()
+        meta = json.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+        _tables[name] = (version, table, meta)
+
+    return _tables[name]
+
+
+def load(name):
+    """
+    (DataFrame, meta) döner; snapshot yoksa (boş DataFrame, {}).
+    Sayısal kolonlar map edilmiş bellek üzerinden kopyasız çevrilir.
+    """
+    _, table, meta = _open(name)
+    if table is None:
+        return pd.DataFrame(), {}
+    return table.to_pandas(split_blocks=True), meta
+
+
+def age(name):
+    """Snapshot yaşı (saniye), snapshot yoksa None."""
+    _, _, meta = _open(name)
+    if meta is None:
+        return None
+    return time.time() - meta.get("created", 0)
+
+# =====================================================
+# TAZELEME
+# =====================================================
+def ensure_fresh(name, ttl, producer):
+    """
+    `name` snapshot'ı ttl saniyeden eskiyse producer() çalıştırılıp sonuç
+    yayınlanır. producer {snapshot_adı: (df, meta)} döner; `name` en son
+    yayınlanır ki tazelik kontrolü diğerlerini de kapsasın. producer boş
+    sözlük dönerse (çekim başarısız) mevcut snapshot yayında kalır.
+    Yeni veri yayınlandıysa True döner.
+
+    Aynı anda yalnızca bir süreç tazeleme yapar. Diğerleri, elde bir
+    snapshot varsa beklemeden mevcut veriyi kullanır.
+    """
+    current_age = age(name)
+    if current_age is not None and current_age < ttl:
+        return False
+
+    try:
+        with FileLock(_lock_path(name), timeout=0 if current_age is not None else -1):
+            current_age = age(name)
+            if current_age is not None and current_age < ttl:
+                return False
+
+            frames = producer()
+            for key in sorted(frames, key=lambda k: k == name):
+                df, meta = frames[key]
+                publish(key, df, meta)
+            return bool(frames)
+    except Timeout:
+        return False
+
+
+def ensure_derived(name, sources, producer):
+    """
+    Başka snapshot'lardan türetilen `name` snapshot'ını günceller. Türetilmiş
+    snapshot'ın meta'sında kaynakların sürümleri saklanır; kaynaklardan biri
+    yeniden yayınlanmadıkça producer tekrar çalışmaz. producer'ın döndüğü
+    sözlük ensure_fresh ile aynı biçimdedir.
+    """
+    versions = {s: current_version(s) for s in sources}
+    _, _, meta = _open(name)
+    if meta is not None and meta.get("sources") == versions:
+        return False
+
+    with FileLock(_lock_path(name)):
+        _, _, meta = _open(name)
+        if meta is not None and meta.get("sources") == versions:
+            return False
+
+        frames = producer()
+        for key in sorted(frames, key=lambda k: k == name):
+            df, frame_meta = frames[key]
+            publish(key, df, {**(frame_meta or {}), "sources": versions})
+        return bool(frames)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark ve deneme amaçlı sentetik rapor verisi üretir.
+
+    python synthetic_data.py --scale 10
+
+scale=1 yoğun bir günün hacmidir; 10 ve 100 sezon zirvesi senaryoları
+içindir. Değerler gerçek ekranlardaki pürüzleri de içerir: binlik ayırıcı
+virgül, boş hücre, tanımsız statü, bozuk tarih.
+"""
+import os
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# HACİM (scale=1 → yoğun bir gün)
+# =====================================================
+BUSY_DAY = {
+    "toplama_calisan": 400,      # PersonBasedHourlyPickingPerformance satırı
+    "yerlestirme_calisan": 150,  # UserBasedHourlyInboundOrdersPerformance satırı
+    "siparis_satiri": 15000,     # OutboundOrderList export satırı
+}
+BACKLOG_DAYS = 30
+
+EXCEL_MAX_ROWS = 1_048_575  # başlık satırı hariç
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, "output", "synthetic")
+
+STATUSES = [
+    ("Henüz aktif edilmedi", 0.35),
+    ("Toplama iş emri oluşturuldu", 0.25),
+    ("Toplandı", 0.30),
+    ("İptal Edildi", 0.04),   # raporda tanımsız statüler
+    ("Sevk Edildi", 0.04),
+    ("", 0.02),
+]
+
+# =====================================================
+# YARDIMCI
+# =====================================================
+def _names(rng, n, prefix):
+    first = np.array(["AHMET", "MEHMET", "AYŞE", "FATMA", "ALİ", "ZEYNEP", "MUSTAFA", "EMİNE", "İBRAHİM", "HÜLYA"])
+    last = np.array(["YILMAZ", "KAYA", "DEMİR", "ŞAHİN", "ÇELİK", "YILDIZ", "ÖZTÜRK", "AYDIN", "ARSLAN", "DOĞAN"])
+    return [
+        f"{first[i % len(first)]} {last[(i // len(first)) % len(last)]} {prefix}{i:05d}"
+        for i in rng.permutation(n)
+    ]
+
+
+def _hourly_counts(rng, n, mean, bulk_ratio=0.03, bulk_mean=1200):
+    """
+    Çalışan × saat adetleri. Satırların küçük bir kısmı koli/palet bazlı
+    toplu işlem yapan çalışanlardır; saatlik adetleri 1000'i aşar ve
+    ekranda binlik ayırıcıyla görünür.
+    """
+    counts = rng.poisson(mean, size=(n, 24))
+    bulk = rng.random(n) < bulk_ratio
+    counts[bulk] = rng.poisson(bulk_mean, size=(int(bulk.sum()), 24))
+    counts[rng.random((n, 24)) < 0.3] = 0
+    return counts
+
+
+def _messy_counts(rng, counts, blank_ratio=0.15):
+    """Sayıları ekrandaki gibi metne çevirir: 1234 → "1,234", bazıları boş."""
+    out = counts.astype(str).astype(object)
+    big = counts >= 1000
+    out[big] = [f"{v:,}" for v in counts[big]]
+    out[rng.random(counts.shape) < blank_ratio] = ""
+    return out
+
+# =====================================================
+# TOPLAMA (DevExtreme grid)
+# =====================================================
+def make_grid(scale=1, seed=0):
+    """
+    toplama.read_grid'in tarayıcıdan okuduğu (headers, rows) ikilisi.
+    Her satır: personel, sicil, 00:00 … 23:00.
+    """
+    rng = np.random.default_rng(seed)
+    n = max(1, int(BUSY_DAY["toplama_calisan"] * scale))
+
+    headers = ["Personel", "Sicil"] + [f"{h:02d}:00" for h in range(24)]
+    counts = _hourly_counts(rng, n, 45)
+    cells = _messy_counts(rng, counts)
+
+    names = _names(rng, n, "P")
+    rows = [
+        [names[i], str(100000 + i)] + cells[i].tolist()
+        for i in range(n)
+    ]
+    return headers, rows
+
+
+class FakeDriver:
+    """read_grid'e verilecek, execute_script çağrılarını cevaplayan sahte driver."""
+
+    def __init__(self, headers, rows):
+        self.headers = headers
+        self.rows = rows
+
+    def execute_script(self, script, *args):
+        if "dx-datagrid-headers" in script:
+            return self.headers
+        return self.rows
+
+# =====================================================
+# YERLEŞTİRME (xlsx export)
+# =====================================================
+def make_inbound_frame(scale=1, seed=0):
+    """yerlestirme.excel_duzenle'nin okuduğu saatlik xlsx'in DataFrame hali."""
+    rng = np.random.default_rng(seed + 1)
+    n = max(1, int(BUSY_DAY["yerlestirme_calisan"] * scale))
+
+    counts = _hourly_counts(rng, n, 90, bulk_ratio=0.02)
+    cells = _messy_counts(rng, counts, blank_ratio=0.1)
+    # xlsx'te boş hücre NaN, sayılar çoğunlukla sayı olarak gelir
+    cells = np.where(cells == "", None, cells)
+    numeric = np.char.isdigit(np.asarray(cells, dtype=str))
+    cells = np.where(numeric, counts, cells)
+
+    df = pd.DataFrame(cells, columns=[f"{h:02d}:00-{(h + 1) % 24:02d}:00" for h in range(24)])
+    df.insert(0, "Kullanıcı", _names(rng, n, "Y"))
+    return df
+
+# =====================================================
+# BACKLOG (OutboundOrderList export)
+# =====================================================
+def make_outbound_frame(scale=1, seed=0, end=None):
+    """
+    backlog.build_report'un beklediği kolon düzeni: 1 → sipariş tarihi,
+    6 → miktar, 11 → statü.
+    """
+    rng = np.random.default_rng(seed + 2)
+    n = max(1, int(BUSY_DAY["siparis_satiri"] * scale))
+    end = end or datetime.now()
+
+    minutes = rng.integers(0, BACKLOG_DAYS * 24 * 60, size=n)
+    dates = pd.Series(pd.Timestamp(end) - pd.to_timedelta(minutes, unit="m")).astype(object)
+    dates[rng.random(n) < 0.005] = "-"
+
+    qty = rng.integers(1, 40, size=n).astype(object)
+    qty[rng.random(n) < 0.01] = "1,250"
+    qty[rng.random(n) < 0.01] = None
+
+    labels, weights = zip(*STATUSES)
+    status = rng.choice(np.array(labels, dtype=object), size=n, p=weights)
+
+    return pd.DataFrame({
+        "Sipariş No": [f"SO{1_000_000 + i}" for i in range(n)],
+        "Sipariş Tarihi": dates,
+        "Müşteri": rng.choice(["ADIDAS", "ADIDAS OUTLET", "ADIDAS B2B"], size=n),
+        "Depo": "295",
+        "Kanal": rng.choice(["E-Ticaret", "Mağaza"], size=n),
+        "SKU": [f"SKU{v:06d}" for v in rng.integers(0, 50000, size=n)],
+        "Miktar": qty,
+        "Şehir": rng.choice(["İSTANBUL", "ANKARA", "İZMİR", "BURSA"], size=n),
+        "Kargo": rng.choice(["Yurtiçi", "Aras", "MNG"], size=n),
+        "Öncelik": rng.choice(["Normal", "Acil"], size=n, p=[0.9, 0.1]),
+        "Dalga": rng.integers(1, 20, size=n),
+        "Statü": status,
+    })
+
+# =====================================================
+# XLSX
+# =====================================================
+def write_xlsx(df, path):
+    """Excel satır sınırını aşan tablolar yazılamaz; None döner."""
+    if len(df) > EXCEL_MAX_ROWS:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_excel(path, index=False, engine="openpyxl")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik rapor verisi üretir")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    tag = f"x{args.scale:g}"
+    for name, df in [
+        ("yerlestirme", make_inbound_frame(args.scale, args.seed)),
+        ("backlog", make_outbound_frame(args.scale, args.seed)),
+    ]:
+        path = write_xlsx(df, os.path.join(args.out, f"{name}_{tag}.xlsx"))
+        print(f"{name}: {len(df)} satır → {path or 'Excel sınırı aşıldı, yazılmadı'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Toplama ve yerleştirme raporlarını tek bir çalışan × saat verimlilik
+modelinde birleştirir.
+
+İki rapor farklı etiketler kullanır (toplam satırı "GENEL TOPLAM" / "TOPLAM",
+toplam kolonu "TOPLAM" / "Toplam Adet", saat kolonu "08:00" /
+"08:00-09:00"). Burada ikisi de aynı uzun formata çevrilir:
+
+    calisan_key | calisan | islem | saat | adet
+"""
+import os
+import json
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+KPI_CONFIG_PATH = os.path.join(BASE_DIR, "kpi_config.json")
+
+TOTAL_LABELS = ["TOPLAM", "GENEL TOPLAM"]
+HOUR_PATTERN = r"^\s*(\d{1,2})\s*:"  # "08:00" ve "08:00-09:00" → 8
+ISLEMLER = ["toplama", "yerlestirme"]
+DEFAULT_TARGETS = {"toplama": 50, "yerlestirme": 100}
+
+# =====================================================
+# NORMALİZASYON
+# =====================================================
+def normalize_names(names):
+    """
+    Eşleştirme anahtarı: baştaki/sondaki boşluklar atılır, iç boşluklar
+    teke indirilir, Türkçe kurala göre büyük harfe çevrilir (i → İ, ı → I).
+    """
+    return (
+        names.astype(str)
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.replace("i", "İ", regex=False)
+        .str.replace("ı", "I", regex=False)
+        .str.upper()
+    )
+
+
+def hour_columns(columns):
+    """{kolon: saat} sözlüğü; saat başlığı olmayan kolonlar atlanır."""
+    columns = pd.Index(columns)
+    saat = pd.to_numeric(
+        pd.Series(columns, dtype=str).str.extract(HOUR_PATTERN, expand=False)
+    )
+    valid = saat.between(0, 23).values
+    return dict(zip(columns[valid], saat[valid].astype(int)))
+
+
+def drop_totals(df):
+    """İlk kolonu toplam etiketi olan satırları atar, çalışan satırları kalır."""
+    name_col = df.columns[0]
+    return df[~df[name_col].astype(str).str.strip().str.upper().isin(TOTAL_LABELS)]
+
+
+def to_long(df, islem):
+    """Rapor tablosunu (çalışan satırları × saat kolonları) uzun formata çevirir."""
+    if df.empty:
+        return pd.DataFrame(columns=["calisan_key", "calisan", "islem", "saat", "adet"])
+
+    name_col = df.columns[0]
+    hour_cols = hour_columns(df.columns[1:])
+
+    long = drop_totals(df).melt(
+        id_vars=[name_col],
+        value_vars=list(hour_cols),
+        var_name="saat",
+        value_name="adet",
+    ).rename(columns={name_col: "calisan"})
+
+    long["saat"] = long["saat"].map(hour_cols)
+    long["adet"] = pd.to_numeric(long["adet"], errors="coerce").fillna(0).astype(int)
+    long = long[long["adet"] > 0]
+    long["calisan"] = long["calisan"].astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    long["calisan_key"] = normalize_names(long["calisan"])
+    long["islem"] = islem
+
+    return long[["calisan_key", "calisan", "islem", "saat", "adet"]].reset_index(drop=True)
+
+# =====================================================
+# BİRLEŞİK MODEL
+# =====================================================
+def load_targets():
+    """Saatlik KPI hedefleri; kpi_config.json'daki değerler varsayılanları ezer."""
+    try:
+        with open(KPI_CONFIG_PATH, "r", encoding="utf-8") as f:
+            return {**DEFAULT_TARGETS, **json.load(f)}
+    except (FileNotFoundError, ValueError):
+        return dict(DEFAULT_TARGETS)
+
+
+def build(toplama_df, yerlestirme_df, targets=None):
+    """
+    (uzun tablo, saatlik tablo, liderlik tablosu) döner.
+
+    saatlik: calisan_key × saat satırları, toplama / yerlestirme adet
+    kolonlarıyla (outer merge). liderlik: çalışan başına toplamlar, aktif saat
+    ve KPI. KPI, Toplama / Yerleştirme sekmelerindeki gibi saat başına
+    hedef oranıdır (0-100 ile sınırlı); burada çalışanın aktif saatlerinin
+    ortalaması alınır. Bir saatteki iş yükü iki işlemin hedef oranlarının
+    toplamıdır.
+    """
+    targets = targets or load_targets()
+
+    long = pd.concat(
+        [to_long(toplama_df, "toplama"), to_long(yerlestirme_df, "yerlestirme")],
+        ignore_index=True,
+    )
+
+    # Çalışan × saat: iki işlem yan yana
+    keys = ["calisan_key", "saat"]
+    hourly = None
+    for islem in ISLEMLER:
+        part = (
+            long[long["islem"] == islem]
+            .groupby(keys, as_index=False)["adet"].sum()
+            .rename(columns={"adet": islem})
+        )
+        hourly = part if hourly is None else hourly.merge(part, on=keys, how="outer")
+    hourly[ISLEMLER] = hourly[ISLEMLER].fillna(0).astype(int)
+    hourly["kpi"] = (sum(hourly[i] / targets[i] for i in ISLEMLER) * 100).clip(0, 100)
+
+    # Görünen ad: anahtar başına ilk ham isim
+    names = long.drop_duplicates("calisan_key").set_index("calisan_key")["calisan"]
+
+    leaderboard = hourly.groupby("calisan_key").agg(
+        toplama=("toplama", "sum"),
+        yerlestirme=("yerlestirme", "sum"),
+        aktif_saat=("saat", "nunique"),
+        kpi=("kpi", "mean"),
+    )
+    leaderboard["toplam"] = leaderboard["toplama"] + leaderboard["yerlestirme"]
+    leaderboard["saatlik_ortalama"] = (leaderboard["toplam"] / leaderboard["aktif_saat"]).round(1)
+    leaderboard["kpi"] = leaderboard["kpi"].round().astype(int)
+    leaderboard = (
+        leaderboard.join(names.rename("calisan"))
+        .reset_index()
+        .sort_values(["kpi", "toplam"], ascending=False, ignore_index=True)
+    )
+    leaderboard.insert(0, "sira", leaderboard.index + 1)
+
+    hourly = hourly.drop(columns="kpi").sort_values(keys, ignore_index=True)
+    return long, hourly, leaderboard[
+        ["sira", "calisan", "calisan_key", "toplama", "yerlestirme", "toplam",
+         "aktif_saat", "saatlik_ortalama", "kpi"]
+    ]
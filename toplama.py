@@ -15,6 +15,8 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+from fetch_guard import guarded
+
 # ===============================
 # ENV
 # ===============================
@@ -144,11 +146,24 @@ def read_grid(driver):
 # ===============================
 # RAPOR
 # ===============================
-def run_report():
+def run_report(raise_errors=False):
     """
     Toplama raporunu çalıştırır, DataFrame döner.
-    Streamlit dashboard içinde kullanılacak.
+    Streamlit dashboard içinde kullanılacak. Hata durumunda boş DataFrame
+    döner; raise_errors=True ise hata (CircuitOpenError dahil) fırlatılır.
     """
+    try:
+        with guarded("toplama"):
+            return fetch_report()
+
+    except Exception as e:
+        log.error(str(e))
+        if raise_errors:
+            raise
+        return pd.DataFrame()
+
+
+def fetch_report():
     driver = get_driver()
     wait = WebDriverWait(driver, 60)
 
@@ -182,10 +197,6 @@ def run_report():
 
         return read_grid(driver)
 
-    except Exception as e:
-        log.error(str(e))
-        return pd.DataFrame()
-
     finally:
         driver.quit()
 
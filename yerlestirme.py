@@ -14,6 +14,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from dotenv import load_dotenv
 
+from fetch_guard import guarded
+
 # ===============================
 # ENV
 # ===============================
@@ -141,11 +143,24 @@ def tarih_set(driver, element_id, tarih):
 # ===============================
 # ANA RAPOR MOTORU
 # ===============================
-def run_report():
+def run_report(raise_errors=False):
     """
     Yerleştirme raporunu çalıştırır, DataFrame ve toplam adet döner.
-    Streamlit dashboard içinde kullanılacak.
+    Streamlit dashboard içinde kullanılacak. Hata durumunda boş DataFrame
+    döner; raise_errors=True ise hata (CircuitOpenError dahil) fırlatılır.
     """
+    try:
+        with guarded("yerlestirme"):
+            return fetch_report()
+
+    except Exception as e:
+        logging.error(str(e))
+        if raise_errors:
+            raise
+        return pd.DataFrame()
+
+
+def fetch_report():
     driver = None
     vardiya = aktif_vardiya()
 
@@ -187,10 +202,6 @@ def run_report():
         logging.info("Rapor başarıyla tamamlandı")
         return df
 
-    except Exception as e:
-        logging.error(str(e))
-        return pd.DataFrame()
-
     finally:
         if driver:
             driver.quit()
\ No newline at end of file